@@ -79,6 +79,9 @@ protected function extractEventData(\ICal\Event $vevent): ?array
             $dtstart = $vevent->dtstart;
             $dtend = $vevent->dtend;
             $uid = $vevent->uid;
+            // ics-parser range les propriétés X-* dans additionalProperties : l'accès
+            // magique $vevent->x_hash ne passe pas par isset() et donc pas par ??
+            $hash = $vevent->additionalProperties['x_hash'] ?? null;
 
             if (! $summary || ! $dtstart) {
                 \Log::warning('Event rejected: missing SUMMARY or DTSTART');
@@ -132,6 +135,11 @@ protected function extractEventData(\ICal\Event $vevent): ?array
                 'type' => $this->determineEventType($title, $description),
             ];
 
+            // Empreinte du contenu (X-HASH) pour ignorer les événements inchangés
+            if ($hash) {
+                $result['metadata'] = ['hash' => $hash];
+            }
+
             return $result;
         } catch (\Exception $e) {
             \Log::error('extractEventData exception: '.$e->getMessage());
@@ -236,6 +244,12 @@ protected function determineEventType(string $title, ?string $description): stri
     /**
      * Importe les événements dans la base de données
      *
+     * Les événements portant une empreinte de contenu (UID + X-HASH générés
+     * par main.py) sont synchronisés sur leur external_id : mis à jour si
+     * l'empreinte a changé, ignorés sinon.
+     *
+     * Options : replace_existing, ignore_past_events, source (ics_import par défaut)
+     *
      * @param  array  $events  Événements à importer
      * @param  int  $userId  ID de l'utilisateur qui importe
      * @param  array  $options  Options d'importation
@@ -251,6 +265,17 @@ public function importEvents(array $events, int $userId, array $options = []): a
 
         $replaceExisting = $options['replace_existing'] ?? false;
         $ignorePastEvents = $options['ignore_past_events'] ?? true;
+        $source = $options['source'] ?? 'ics_import';
+
+        // Le payload JSON de main.py transmet l'empreinte à plat
+        $events = array_map(function (array $eventData) {
+            if (isset($eventData['hash'])) {
+                $eventData['metadata'] = array_merge($eventData['metadata'] ?? [], ['hash' => $eventData['hash']]);
+                unset($eventData['hash']);
+            }
+
+            return $eventData;
+        }, $events);
 
         DB::beginTransaction();
 
@@ -267,12 +292,22 @@ public function importEvents(array $events, int $userId, array $options = []): a
                     return Carbon::parse($event['end_time']);
                 });
 
+                // Les événements synchronisés par UID sont mis à jour plus bas, pas supprimés
+                $syncedIds = $eventsCollection
+                    ->filter(fn ($event) => ! empty($event['external_id']) && isset($event['metadata']['hash']))
+                    ->pluck('external_id')
+                    ->all();
+
                 Event::query()
                     ->whereNot('source', 'manual')
                     ->where(function ($query) use ($min, $max) {
                         $query->whereBetween('start_time', [$min, $max])
                             ->orWhereBetween('end_time', [$min, $max]);
                     })
+                    ->where(function ($query) use ($syncedIds) {
+                        $query->whereNull('external_id')
+                            ->orWhereNotIn('external_id', $syncedIds);
+                    })
                     ->delete();
             }
 
@@ -299,8 +334,16 @@ public function importEvents(array $events, int $userId, array $options = []): a
                     // Vérifier si l'événement existe déjà (basé sur external_id)
                     if (! empty($eventData['external_id'])) {
                         $existing = Event::where('external_id', $eventData['external_id'])->first();
+                        $hash = $eventData['metadata']['hash'] ?? null;
+
+                        if ($existing && $hash !== null) {
+                            // Même empreinte de contenu : l'événement n'a pas changé
+                            if (($existing->metadata['hash'] ?? null) === $hash) {
+                                $skipped++;
 
-                        if ($existing && ! $replaceExisting) {
+                                continue;
+                            }
+                        } elseif ($existing && ! $replaceExisting) {
                             $skipped++;
 
                             continue;
@@ -309,7 +352,7 @@ public function importEvents(array $events, int $userId, array $options = []): a
                         if ($existing) {
                             $existing->update(array_merge($eventData, [
                                 'updated_by' => $userId,
-                                'source' => 'ics_import',
+                                'source' => $source,
                             ]));
                             $imported++;
 
@@ -320,7 +363,7 @@ public function importEvents(array $events, int $userId, array $options = []): a
                     // Créer un nouvel événement
                     Event::create(array_merge($eventData, [
                         'created_by' => $userId,
-                        'source' => 'ics_import',
+                        'source' => $source,
                     ]));
 
                     $imported++;
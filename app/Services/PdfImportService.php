@@ -2,6 +2,7 @@
 
 namespace App\Services;
 
+use Illuminate\Process\Exceptions\ProcessTimedOutException;
 use Illuminate\Support\Facades\Log;
 use Illuminate\Support\Facades\Process;
 
@@ -10,6 +11,10 @@ class PdfImportService
     /**
      * Process a PDF file and extract events data
      *
+     * When a page or the whole job exceeds its time budget, the events
+     * extracted before the timeout are returned with `partial` set to true
+     * and the timeout details in `errors`.
+     *
      * @param  string  $filePath  Full path to the PDF file
      * @return array The extracted events data
      *
@@ -32,9 +37,35 @@ public function processFile(string $filePath): array
 
         try {
 
-            $result = Process::run(['uv', 'run', $scriptPath, '--output', $outputFilePath, $filePath]);
+            $pageTimeout = (int) config('services.pdf_import.page_timeout', 30);
+            $jobTimeout = (int) config('services.pdf_import.job_timeout', 120);
+
+            // Marge au-delà du budget du script pour le démarrage de uv et l'export ;
+            // sans budget (0), le script n'est pas limité dans le temps
+            $process = $jobTimeout > 0
+                ? Process::timeout($jobTimeout + 30)
+                : Process::forever();
+
+            try {
+                $result = $process->run([
+                    'uv', 'run', $scriptPath,
+                    '--pages', (string) config('services.pdf_import.pages', '0'),
+                    '--page-timeout', (string) $pageTimeout,
+                    '--job-timeout', (string) $jobTimeout,
+                    '--output', $outputFilePath,
+                    $filePath,
+                ]);
+            } catch (ProcessTimedOutException $e) {
+                throw new \Exception('Python script timed out after '.($jobTimeout + 30).' seconds');
+            }
+
+            $timeoutErrors = $this->parseTimeoutErrors($result->errorOutput());
 
             if ($result->failed()) {
+                if ($timeoutErrors !== []) {
+                    throw new \Exception('PDF extraction timed out on page '.$timeoutErrors[0]['page']);
+                }
+
                 throw new \Exception('Python Error: '.$result->errorOutput());
             }
 
@@ -49,12 +80,44 @@ public function processFile(string $filePath): array
                 throw new \Exception('Failed to parse JSON output: '.json_last_error_msg());
             }
 
+            $data['partial'] = $timeoutErrors !== [];
+            $data['errors'] = $timeoutErrors;
+
+            if ($data['partial']) {
+                Log::warning('PDF extraction returned partial results', ['errors' => $timeoutErrors]);
+            }
+
             return $data;
         } finally {
-            // Clean up the temporary input file
+            // Clean up the temporary input and output files
             if (file_exists($filePath)) {
                 unlink($filePath);
             }
+
+            if (file_exists($outputFilePath)) {
+                unlink($outputFilePath);
+            }
         }
     }
+
+    /**
+     * Extract the structured timeout errors printed by the Python script
+     *
+     * @param  string  $errorOutput  Standard error output of the script
+     * @return array<int, array{error: string, page: int, budget: string, seconds: float}>
+     */
+    protected function parseTimeoutErrors(string $errorOutput): array
+    {
+        $errors = [];
+
+        foreach (preg_split('/\R/', $errorOutput) as $line) {
+            $decoded = json_decode(trim($line), true);
+
+            if (is_array($decoded) && ($decoded['error'] ?? null) === 'timeout') {
+                $errors[] = $decoded;
+            }
+        }
+
+        return $errors;
+    }
 }
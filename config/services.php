@@ -38,5 +38,11 @@
     'discord' => [
         'webhook_url' => env('DISCORD_WEBHOOK_URL'),
     ],
+
+    'pdf_import' => [
+        'pages' => env('PDF_IMPORT_PAGES', '0'),
+        'page_timeout' => (int) env('PDF_IMPORT_PAGE_TIMEOUT', 30),
+        'job_timeout' => (int) env('PDF_IMPORT_JOB_TIMEOUT', 120),
+    ],
 ];
 
@@ -11,10 +11,18 @@ Structure:
 """
 
 import argparse
+import gzip
+import hashlib
 import json
+import os
 import re
+import signal
+import stat
 import sys
-from datetime import datetime, timedelta
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
 from math import e
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -34,29 +42,87 @@ except ImportError:
     Event = None
 
 
+# Days of week that start a day row in the timetable
+DAYS_OF_WEEK = [
+    "Lundi",
+    "Mardi",
+    "Mercredi",
+    "Jeudi",
+    "Vendredi",
+    "Samedi",
+    "Dimanche",
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+# Version of the raw table snapshot format (see save_raw_snapshot)
+RAW_SNAPSHOT_VERSION = 1
+
+# Spool of the default Laravel payloads (see write_to_spool)
+DEFAULT_SPOOL_MAX_AGE = 3600
+DEFAULT_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Result files younger than this (seconds) are never evicted for size
+SPOOL_MIN_AGE = 60
+
+
+class TimeBudgetExceeded(Exception):
+    """Raised when a page or the whole job runs out of its time budget"""
+
+    def __init__(self, page: int, budget: str, seconds: float):
+        self.page = page
+        self.budget = budget
+        self.seconds = seconds
+        super().__init__(
+            f"Time budget exceeded on page {page} ({budget} budget: {seconds:g}s)"
+        )
+
+    def to_dict(self) -> Dict[str, str | int | float]:
+        return {
+            "error": "timeout",
+            "page": self.page,
+            "budget": self.budget,
+            "seconds": self.seconds,
+        }
+
+
 class TimetableEntry:
     """Represents a single timetable entry"""
 
     def __init__(
-        self, day: str, time_slot: str, week: str, course: str, professor: str
+        self,
+        day: str,
+        time_slot: str,
+        week: str,
+        course: str,
+        professor: str,
+        table: int = 0,
     ):
         self.day = day
         self.time_slot = time_slot
         self.week = week
         self.course = course
         self.professor = professor
+        self.table = table
 
-    def to_dict(self) -> Dict[str, str]:
+    def to_dict(self) -> Dict[str, str | int]:
         return {
             "day": self.day,
             "time_slot": self.time_slot,
             "week": self.week,
             "course": self.course,
             "professor": self.professor,
+            "table": self.table,
         }
 
     def __repr__(self):
-        return f"{self.day} {self.time_slot} (Week {self.week}): {self.course} - {self.professor}"
+        table_str = f" [Table {self.table}]" if self.table else ""
+        return f"{self.day} {self.time_slot} (Week {self.week}){table_str}: {self.course} - {self.professor}"
 
 
 def parse_timetable(
@@ -86,22 +152,7 @@ def parse_timetable(
     entries = []
 
     # Days of week to recognize
-    days_of_week = [
-        "Lundi",
-        "Mardi",
-        "Mercredi",
-        "Jeudi",
-        "Vendredi",
-        "Samedi",
-        "Dimanche",
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
-        "Sunday",
-    ]
+    days_of_week = DAYS_OF_WEEK
 
     # Parse the table structure:
     # Row 1: Day name with dates "Lundi 15/9 29/9 13/10..."
@@ -126,9 +177,9 @@ def parse_timetable(
         first_col = row[0].strip() if row[0] else ""
 
         # Check if this is a day row
-        is_day_row = any(first_col.startswith(day) for day in days_of_week)
+        starts_day = any(first_col.startswith(day) for day in days_of_week)
 
-        if is_day_row:
+        if starts_day:
             # Extract day name
             for day in days_of_week:
                 if first_col.startswith(day):
@@ -286,16 +337,18 @@ def parse_timetable(
     return entries
 
 
-def extract_table_from_pdf(pdf_path: str, page_num: int = 0) -> List[List[str | None]]:
+def extract_tables_from_pdf(
+    pdf_path: str, page_num: int = 0
+) -> List[List[List[str | None]]]:
     """
-    Extract table data from a PDF file.
+    Extract every table of a PDF page.
 
     Args:
         pdf_path: Path to the PDF file
         page_num: Page number to extract (0-indexed)
 
     Returns:
-        Raw table data
+        Raw table data of each table, in page order
     """
     pdf_file = Path(pdf_path)
 
@@ -321,13 +374,168 @@ def extract_table_from_pdf(pdf_path: str, page_num: int = 0) -> List[List[str |
 
         if tables:
             # print(f"Found {len(tables)} table(s) on page {page_num + 1}")
-            # Return the first table (or you can modify to handle multiple)
-            return tables[0]
+            return tables
         else:
             print(f"No tables found on page {page_num + 1}")
             return []
 
 
+@contextmanager
+def time_budget(seconds: Optional[float], error: TimeBudgetExceeded):
+    """
+    Interrupt the enclosed block once the time budget is spent.
+
+    Relies on SIGALRM, so the budget is only enforced on platforms that
+    support it and when called from the main thread.
+
+    Args:
+        seconds: Time left in seconds (None or <= 0 to disable)
+        error: Exception raised when the time is up
+    """
+    if not seconds or seconds <= 0 or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise error
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def page_spec(value: str) -> str:
+    """
+    Validate a page selection for argparse (see parse_page_spec).
+
+    Args:
+        value: Page selection string
+
+    Returns:
+        The page selection, unchanged
+    """
+    if value.strip().lower() == "all":
+        return value
+
+    parts = [part.strip() for part in value.split(",") if part.strip()]
+    if not parts:
+        raise argparse.ArgumentTypeError(f"invalid page selection: '{value}'")
+
+    for part in parts:
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", part)
+        if not match or (match.group(2) and int(match.group(2)) < int(match.group(1))):
+            raise argparse.ArgumentTypeError(
+                f'invalid page selection: \'{value}\' (expected "all" or e.g. "0,2-4")'
+            )
+
+    return value
+
+
+def parse_page_spec(spec: str, page_count: int) -> List[int]:
+    """
+    Parse a page selection like "all", "2" or "0,2-4" (0-indexed).
+
+    Args:
+        spec: Page selection string
+        page_count: Number of pages in the PDF
+
+    Returns:
+        Sorted list of page numbers that exist in the PDF
+    """
+    if spec.strip().lower() == "all":
+        return list(range(page_count))
+
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            pages.update(range(int(start), int(end) + 1))
+        else:
+            pages.add(int(part))
+
+    return sorted(page for page in pages if 0 <= page < page_count)
+
+
+def extract_tables_with_budget(
+    pdf_path: str,
+    pages: str,
+    page_timeout: Optional[float] = None,
+    job_timeout: Optional[float] = None,
+) -> tuple[List[List[List[List[str | None]]]], List[TimeBudgetExceeded]]:
+    """
+    Extract tables from several pages, within per-page and per-job time budgets.
+
+    Pages are processed in order. A page that runs out of its budget is
+    skipped (no tables) and extraction goes on with the next page; once the
+    job budget runs out, the remaining pages are skipped, with one error
+    each. The tables
+    extracted in time are returned along with the timeout errors, so the
+    caller can still produce a partial result.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: Page selection (see parse_page_spec)
+        page_timeout: Maximum seconds spent on a single page
+        job_timeout: Maximum seconds spent on the whole extraction
+
+    Returns:
+        (tables, errors) tuple, tables holding the list of tables of each
+        page and errors being empty when every page completed
+    """
+    pdf_file = Path(pdf_path)
+
+    if not pdf_file.exists():
+        print(f"Error: File '{pdf_path}' not found.")
+        sys.exit(1)
+
+    started = time.monotonic()
+    tables = []
+    errors = []
+
+    with pdfplumber.open(pdf_file) as pdf:
+        page_nums = parse_page_spec(pages, len(pdf.pages))
+        for position, page_num in enumerate(page_nums):
+            seconds = page_timeout
+            error = TimeBudgetExceeded(page_num, "page", page_timeout or 0)
+            if job_timeout and job_timeout > 0:
+                remaining = job_timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    errors.extend(
+                        TimeBudgetExceeded(page, "job", job_timeout)
+                        for page in page_nums[position:]
+                    )
+                    break
+                if not seconds or seconds <= 0 or remaining < seconds:
+                    seconds = remaining
+                    error = TimeBudgetExceeded(page_num, "job", job_timeout)
+
+            try:
+                with time_budget(seconds, error):
+                    page_tables = pdf.pages[page_num].extract_tables()
+            except TimeBudgetExceeded as exceeded:
+                errors.append(exceeded)
+                if exceeded.budget == "job":
+                    # Every remaining page is skipped too
+                    errors.extend(
+                        TimeBudgetExceeded(page, "job", job_timeout)
+                        for page in page_nums[position + 1 :]
+                    )
+                    break
+                # Keep page positions aligned for stitch_tables
+                page_tables = []
+
+            tables.append(page_tables)
+
+    return tables, errors
+
+
 def extract_table_with_coordinates(
     pdf_path: str,
     page_num: int = 0,
@@ -374,6 +582,73 @@ def extract_table_with_coordinates(
         return table if table else []
 
 
+def is_day_row(row: List[str | None]) -> bool:
+    """Check whether a table row starts a new day (e.g. "Lundi 15/9 29/9")"""
+    first_col = row[0].strip() if row and row[0] else ""
+    return any(first_col.startswith(day) for day in DAYS_OF_WEEK)
+
+
+def stitch_tables(
+    pages_tables: List[List[List[List[str | None]]]],
+) -> List[List[List[str | None]]]:
+    """
+    Merge the tables of several pages into one table per table index.
+
+    Tables starting with a day row are indexed by their position among such
+    tables on the page, so the n-th table of every page (e.g. the same group
+    laid out side by side) ends up in the same stitched table. Tables that
+    do not start with a day row continue another table: the n-th of them at
+    the top of a page (before any day row table) continues table n, e.g.
+    side by side groups split by a page break. Otherwise, or when there is
+    no table n yet, a table continues the previous table in reading order.
+
+    Args:
+        pages_tables: List of tables of each page, in page order
+
+    Returns:
+        Stitched tables, by table index
+    """
+    stitched: Dict[int, List[List[str | None]]] = {}
+    index = 0
+
+    for page_tables in pages_tables:
+        position = 0
+        continuation = 0
+        for table in page_tables:
+            first_row = next((row for row in table if row and row[0]), None)
+            if not stitched or (first_row is not None and is_day_row(first_row)):
+                index = position
+                position += 1
+            elif position == 0:
+                # Continuation at the top of the page, by position
+                if continuation in stitched:
+                    index = continuation
+                continuation += 1
+            stitched.setdefault(index, []).extend(table)
+
+    return [stitched[index] for index in sorted(stitched)]
+
+
+def parse_tables(tables: List[List[List[str | None]]]) -> List[TimetableEntry]:
+    """
+    Parse several tables, tagging each entry with its table index.
+
+    Args:
+        tables: Raw tables, by table index
+
+    Returns:
+        Entries of every table, in table order
+    """
+    entries = []
+    for index, table in enumerate(tables):
+        table_entries = parse_timetable(table)
+        for entry in table_entries:
+            entry.table = index
+        entries.extend(table_entries)
+
+    return entries
+
+
 def print_table(table: List[List[str | None]], max_rows: Optional[int] = None):
     """
     Pretty print a table to console.
@@ -446,7 +721,7 @@ def save_to_csv(entries: List[TimetableEntry], output_path: str):
 
     with open(output_file, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(
-            f, fieldnames=["day", "time_slot", "week", "course", "professor"]
+            f, fieldnames=["day", "time_slot", "week", "course", "professor", "table"]
         )
         writer.writeheader()
         for entry in entries:
@@ -467,6 +742,123 @@ def save_to_json(entries: List[TimetableEntry], output_path: str):
     # print(f"\nTimetable saved to JSON: {output_file}")
 
 
+def get_source_metadata(pdf_path: str, pages: str) -> Dict[str, str | int]:
+    """
+    Describe the PDF a raw snapshot was extracted from.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: Page selection that was extracted
+
+    Returns:
+        Source metadata (file name, size, SHA-256 and pages)
+    """
+    pdf_file = Path(pdf_path)
+    digest = hashlib.sha256()
+    with open(pdf_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return {
+        "file": pdf_file.name,
+        "size": pdf_file.stat().st_size,
+        "sha256": digest.hexdigest(),
+        "pages": pages,
+    }
+
+
+def save_raw_snapshot(
+    pages_tables: List[List[List[List[str | None]]]],
+    output_path: str,
+    source: Dict[str, str | int],
+    errors: Optional[List[Dict]] = None,
+):
+    """
+    Save extracted tables to a raw snapshot, to parse them again without the PDF.
+
+    The snapshot is compact JSON, gzip-compressed when output_path ends
+    with ".gz":
+    {"format": "edt-raw", "version": 1, "source": {...},
+     "extracted_at": "...", "pages": [[table, ...], ...], "errors": [...]}
+
+    Args:
+        pages_tables: List of tables of each extracted page
+        output_path: Path to save the snapshot
+        source: Source metadata (see get_source_metadata)
+        errors: Timeout errors raised during extraction
+    """
+    snapshot = {
+        "format": "edt-raw",
+        "version": RAW_SNAPSHOT_VERSION,
+        "source": source,
+        "extracted_at": datetime.now().isoformat(timespec="seconds"),
+        "pages": pages_tables,
+        "errors": errors or [],
+    }
+
+    opener = gzip.open if output_path.endswith(".gz") else open
+    with opener(output_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_raw_snapshot(snapshot_path: str) -> Dict:
+    """
+    Load a raw snapshot written by save_raw_snapshot.
+
+    Args:
+        snapshot_path: Path to the snapshot (gzip-compressed if ending with ".gz")
+
+    Returns:
+        Snapshot data, with the tables of each page under "pages"
+
+    Raises:
+        ValueError: If the file is not a valid raw snapshot
+    """
+    opener = gzip.open if snapshot_path.endswith(".gz") else open
+    with opener(snapshot_path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+
+    if not isinstance(snapshot, dict) or snapshot.get("format") != "edt-raw":
+        raise ValueError(f"'{snapshot_path}' is not a raw table snapshot")
+    if snapshot.get("version") != RAW_SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported raw snapshot version {snapshot.get('version')} "
+            f"(expected {RAW_SNAPSHOT_VERSION})"
+        )
+
+    # Pages hold tables, tables hold rows, rows hold cells
+    pages = snapshot.get("pages")
+    if not isinstance(pages, list) or not all(
+        isinstance(page, list)
+        and all(
+            isinstance(table, list)
+            and all(
+                isinstance(row, list)
+                and all(cell is None or isinstance(cell, str) for cell in row)
+                for row in table
+            )
+            for table in page
+        )
+        for page in pages
+    ):
+        raise ValueError(f"'{snapshot_path}' has missing or invalid pages")
+
+    errors = snapshot.get("errors")
+    if not isinstance(errors, list) or not all(
+        isinstance(error, dict)
+        and isinstance(error.get("page"), int)
+        and isinstance(error.get("budget"), str)
+        and isinstance(error.get("seconds"), (int, float))
+        for error in errors
+    ):
+        raise ValueError(f"'{snapshot_path}' has missing or invalid errors")
+
+    if not isinstance(snapshot.get("source"), dict):
+        raise ValueError(f"'{snapshot_path}' has missing or invalid source")
+
+    return snapshot
+
+
 def parse_week_date(week_str: str, year: Optional[int] = None) -> Optional[datetime]:
     """
     Parse week date string like '15/9' or '29/9' to datetime.
@@ -525,8 +917,145 @@ def get_day_offset(day_name: str) -> int:
     return days.get(day_name.lower(), 0)
 
 
+def get_event_datetimes(
+    entry: TimetableEntry, year: int
+) -> Optional[tuple[datetime, datetime]]:
+    """
+    Compute the start and end datetimes of a timetable entry.
+
+    Args:
+        entry: TimetableEntry to place in the calendar
+        year: Year for the timetable
+
+    Returns:
+        (dtstart, dtend) tuple, or None if the week date cannot be parsed
+    """
+    # Parse the week date
+    event_date = parse_week_date(entry.week, year)
+    if not event_date:
+        return None
+
+    # Adjust to correct day of week
+    day_offset = get_day_offset(entry.day)
+    # Get the Monday of that week
+    days_since_monday = event_date.weekday()
+    monday = event_date - timedelta(days=days_since_monday)
+    # Add offset for target day
+    target_date = monday + timedelta(days=day_offset)
+
+    # Time slot mappings
+    time_slots = {
+        "morning (8:30-12:15)": ("08:30", "12:15"),
+        "afternoon (13:30-17:15)": ("13:30", "17:15"),
+    }
+
+    # Get time slot
+    time_slot_key = entry.time_slot.lower()
+    if time_slot_key not in time_slots:
+        # Try to match partial
+        for key in time_slots:
+            if key.split("(")[0].strip() in time_slot_key:
+                time_slot_key = key
+                break
+
+    start_time, end_time = time_slots.get(time_slot_key, ("08:30", "12:15"))
+
+    # Create start and end datetime
+    start_hour, start_min = map(int, start_time.split(":"))
+    end_hour, end_min = map(int, end_time.split(":"))
+
+    dtstart = datetime(
+        target_date.year, target_date.month, target_date.day, start_hour, start_min
+    )
+    dtend = datetime(
+        target_date.year, target_date.month, target_date.day, end_hour, end_min
+    )
+
+    return dtstart, dtend
+
+
+def get_slot_key(entry: TimetableEntry) -> str:
+    """Get the short slot name of an entry (e.g. "morning" or "afternoon")"""
+    return entry.time_slot.split("(")[0].strip().lower()
+
+
+def make_event_uid(key: str, seen: Optional[Dict[str, int]] = None) -> str:
+    """
+    Hash a UID key into a UID.
+
+    When seen is given, it counts the keys already used in the export, and
+    the n-th repeat of a key gets "|#n" appended before hashing, so several
+    events of the same half-day (e.g. two courses in one week column) keep
+    distinct UIDs.
+
+    Args:
+        key: UID key (see get_event_uid)
+        seen: Number of times each key was used so far in the export
+
+    Returns:
+        UID string
+    """
+    if seen is not None:
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        if occurrence:
+            key = f"{key}|#{occurrence}"
+    return f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}@edt-ocr"
+
+
+def get_event_uid(
+    entry: TimetableEntry,
+    dtstart: datetime,
+    series: str,
+    seen: Optional[Dict[str, int]] = None,
+) -> str:
+    """
+    Build a deterministic UID for an event.
+
+    The UID only depends on (series, date, slot), the table index for
+    entries of other tables than the first one, and the rank of the entry
+    among the entries of the same half-day (see make_event_uid). A half-day
+    thus keeps the same UID across re-imports even when its course or
+    teacher changes.
+
+    Args:
+        entry: TimetableEntry the event comes from
+        dtstart: Start datetime of the event
+        series: Timetable series identifier (e.g. the group or promotion)
+        seen: Number of times each UID key was used so far in the export
+
+    Returns:
+        UID string
+    """
+    key = f"{series}|{dtstart.date().isoformat()}|{get_slot_key(entry)}"
+    if entry.table:
+        key = f"{key}|{entry.table}"
+    return make_event_uid(key, seen)
+
+
+def get_event_hash(entry: TimetableEntry, dtstart: datetime, dtend: datetime) -> str:
+    """
+    Hash the content of an event so importers can skip unchanged events.
+
+    Args:
+        entry: TimetableEntry the event comes from
+        dtstart: Start datetime of the event
+        dtend: End datetime of the event
+
+    Returns:
+        Hex digest of the event content
+    """
+    content = "|".join(
+        [entry.course, entry.professor, dtstart.isoformat(), dtend.isoformat()]
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
 def save_to_ics(
-    entries: List[TimetableEntry], output_path: str, year: Optional[int] = None
+    entries: List[TimetableEntry],
+    output_path: str,
+    year: Optional[int] = None,
+    series: str = "edt",
 ):
     """
     Save timetable entries to ICS (iCalendar) file.
@@ -535,6 +1064,7 @@ def save_to_ics(
         entries: List of TimetableEntry objects
         output_path: Path to save ICS file
         year: Year for the timetable (defaults to 2025)
+        series: Timetable series identifier used to derive event UIDs
     """
     if Calendar is None or Event is None:
         print("Error: icalendar library not installed. Cannot create ICS file.")
@@ -556,47 +1086,16 @@ def save_to_ics(
     cal.add("x-wr-calname", "Course Timetable")
     cal.add("x-wr-timezone", "Europe/Paris")
 
-    # Time slot mappings
-    time_slots = {
-        "morning (8:30-12:15)": ("08:30", "12:15"),
-        "afternoon (13:30-17:15)": ("13:30", "17:15"),
-    }
+    # Events carry no revision number: DTSTAMP tells clients when they were
+    # exported and X-HASH whether their content changed
+    dtstamp = datetime.now(timezone.utc)
+    uids_seen: Dict[str, int] = {}
 
     for entry in entries:
-        # Parse the week date
-        event_date = parse_week_date(entry.week, year)
-        if not event_date:
+        datetimes = get_event_datetimes(entry, year)
+        if not datetimes:
             continue
-
-        # Adjust to correct day of week
-        day_offset = get_day_offset(entry.day)
-        # Get the Monday of that week
-        days_since_monday = event_date.weekday()
-        monday = event_date - timedelta(days=days_since_monday)
-        # Add offset for target day
-        target_date = monday + timedelta(days=day_offset)
-
-        # Get time slot
-        time_slot_key = entry.time_slot.lower()
-        if time_slot_key not in time_slots:
-            # Try to match partial
-            for key in time_slots:
-                if key.split("(")[0].strip() in time_slot_key:
-                    time_slot_key = key
-                    break
-
-        start_time, end_time = time_slots.get(time_slot_key, ("08:30", "12:15"))
-
-        # Create start and end datetime
-        start_hour, start_min = map(int, start_time.split(":"))
-        end_hour, end_min = map(int, end_time.split(":"))
-
-        dtstart = datetime(
-            target_date.year, target_date.month, target_date.day, start_hour, start_min
-        )
-        dtend = datetime(
-            target_date.year, target_date.month, target_date.day, end_hour, end_min
-        )
+        dtstart, dtend = datetimes
 
         # Create event
         event = Event()
@@ -606,6 +1105,9 @@ def save_to_ics(
         if "[EXAMEN]" in entry.course:
             summary = f"🎓 EXAM: {entry.course.replace('[EXAMEN]', '').strip()}"
 
+        event.add("uid", get_event_uid(entry, dtstart, series, uids_seen))
+        event.add("dtstamp", dtstamp)
+        event.add("x-hash", get_event_hash(entry, dtstart, dtend))
         event.add("summary", summary)
         event.add("dtstart", dtstart)
         event.add("dtend", dtend)
@@ -643,7 +1145,859 @@ def save_to_ics(
     # print("Import this file into Google Calendar, Outlook, or Apple Calendar")
 
 
+def build_laravel_payload(
+    entries: List[TimetableEntry], year: int, series: str = "edt"
+) -> Dict:
+    """
+    Build the JSON payload expected by the Laravel importer.
+
+    Args:
+        entries: List of TimetableEntry objects
+        year: Year for the timetable
+        series: Timetable series identifier used to derive event UIDs
+
+    Returns:
+        Payload with "events" and "summary" keys
+    """
+    events = []
+    uids_seen: Dict[str, int] = {}
+
+    for entry in entries:
+        datetimes = get_event_datetimes(entry, year)
+        if not datetimes:
+            continue
+        dtstart, dtend = datetimes
+
+        # Convert to format expected by Laravel
+        events.append(
+            {
+                "title": entry.course,
+                "teacher": entry.professor if entry.professor else None,
+                "description": f"{entry.course} - {entry.professor}"
+                if entry.professor
+                else entry.course,
+                "location": None,  # Not available in PDF
+                "start_time": dtstart.isoformat(),
+                "end_time": dtend.isoformat(),
+                "type": "exam" if "[EXAMEN]" in entry.course else "course",
+                "color": None,
+                "external_id": get_event_uid(entry, dtstart, series, uids_seen),
+                "hash": get_event_hash(entry, dtstart, dtend),
+            }
+        )
+
+    return {
+        "events": events,
+        "summary": {
+            "total": len(events),
+            "courses": len([e for e in events if e["type"] == "course"]),
+            "exams": len([e for e in events if e["type"] == "exam"]),
+        },
+    }
+
+
+def build_compact_payload(
+    entries: List[TimetableEntry], year: int, series: str = "edt"
+) -> Dict:
+    """
+    Build the dictionary-encoded compact payload (see docs/COMPACT_FORMAT.md).
+
+    Course titles, teachers and slot names are stored once in lookup tables
+    and events refer to them by index. Each event is a
+    [course, teacher, slot, start, duration] array, where start is in
+    minutes since "epoch", duration in minutes and teacher is -1 when unknown.
+    Entries of other tables than the first one get their table index as a
+    sixth element.
+
+    Args:
+        entries: List of TimetableEntry objects
+        year: Year for the timetable
+        series: Timetable series identifier used to derive event UIDs
+
+    Returns:
+        Compact payload, decodable with decode_compact_payload
+    """
+    placed = []
+    for entry in entries:
+        datetimes = get_event_datetimes(entry, year)
+        if datetimes:
+            placed.append((datetimes[0], datetimes[1], entry))
+    placed.sort(key=lambda item: item[0])
+
+    courses: Dict[str, int] = {}
+    teachers: Dict[str, int] = {}
+    slots: Dict[str, int] = {}
+    epoch = (
+        datetime.combine(placed[0][0].date(), datetime.min.time())
+        if placed
+        else datetime(year, 1, 1)
+    )
+
+    events = []
+    for dtstart, dtend, entry in placed:
+        course_id = courses.setdefault(entry.course, len(courses))
+        teacher_id = (
+            teachers.setdefault(entry.professor, len(teachers))
+            if entry.professor
+            else -1
+        )
+        slot_id = slots.setdefault(get_slot_key(entry), len(slots))
+        event = [
+            course_id,
+            teacher_id,
+            slot_id,
+            int((dtstart - epoch).total_seconds() // 60),
+            int((dtend - dtstart).total_seconds() // 60),
+        ]
+        if entry.table:
+            event.append(entry.table)
+        events.append(event)
+
+    exams = sum(1 for entry in placed if "[EXAMEN]" in entry[2].course)
+
+    return {
+        "format": "edt-compact",
+        "version": 1,
+        "series": series,
+        "epoch": epoch.date().isoformat(),
+        "courses": list(courses),
+        "teachers": list(teachers),
+        "slots": list(slots),
+        "events": events,
+        "summary": {
+            "total": len(events),
+            "courses": len(events) - exams,
+            "exams": exams,
+        },
+    }
+
+
+def decode_compact_payload(data: Dict) -> Dict:
+    """
+    Decode a compact payload back into the regular Laravel payload.
+
+    Reference implementation of docs/COMPACT_FORMAT.md.
+
+    Args:
+        data: Payload produced by build_compact_payload
+
+    Returns:
+        Payload in the build_laravel_payload format
+    """
+    if data.get("format") != "edt-compact" or data.get("version") != 1:
+        raise ValueError("Unsupported compact payload format")
+
+    epoch = datetime.fromisoformat(data["epoch"])
+    courses = data["courses"]
+    teachers = data["teachers"]
+    slots = data["slots"]
+    series = data["series"]
+
+    events = []
+    uids_seen: Dict[str, int] = {}
+    for event in data["events"]:
+        course_id, teacher_id, slot_id, start, duration = event[:5]
+        table = event[5] if len(event) > 5 else 0
+        course = courses[course_id]
+        teacher = teachers[teacher_id] if teacher_id >= 0 else None
+        dtstart = epoch + timedelta(minutes=start)
+        dtend = dtstart + timedelta(minutes=duration)
+        uid_key = f"{series}|{dtstart.date().isoformat()}|{slots[slot_id]}"
+        if table:
+            uid_key = f"{uid_key}|{table}"
+        hash_content = "|".join(
+            [course, teacher or "", dtstart.isoformat(), dtend.isoformat()]
+        )
+
+        events.append(
+            {
+                "title": course,
+                "teacher": teacher,
+                "description": f"{course} - {teacher}" if teacher else course,
+                "location": None,
+                "start_time": dtstart.isoformat(),
+                "end_time": dtend.isoformat(),
+                "type": "exam" if "[EXAMEN]" in course else "course",
+                "color": None,
+                "external_id": make_event_uid(uid_key, uids_seen),
+                "hash": hashlib.sha1(hash_content.encode("utf-8")).hexdigest()[:16],
+            }
+        )
+
+    decoded = {
+        key: value for key, value in data.items() if key in ("partial", "errors")
+    }
+    decoded.update({"events": events, "summary": data["summary"]})
+    return decoded
+
+
+def write_atomic(path: Path, content: str, mode: int = 0o644):
+    """
+    Write a text file through a temporary file and a rename.
+
+    The temporary file is created next to the target with a unique name, so
+    concurrent writers never share it.
+
+    Args:
+        path: Target file path
+        content: File content
+        mode: Permissions of the written file
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(content)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def default_spool_dir() -> Path:
+    """Get the spool directory of the current user, in the system temp directory"""
+    # Not available on every platform (e.g. Windows)
+    if not hasattr(os, "getuid"):
+        return Path(tempfile.gettempdir()) / "edt-ocr"
+    return Path(tempfile.gettempdir()) / f"edt-ocr-{os.getuid()}"
+
+
+def prepare_spool_dir(spool_dir: Path):
+    """
+    Create the spool directory, private to the current user.
+
+    An existing directory must be a real directory (not a symlink) owned by
+    the current user and not writable by anyone else, so other users can
+    neither read nor replace result files. Ownership and permissions are
+    only checked on platforms with POSIX user ids.
+
+    Args:
+        spool_dir: Spool directory
+
+    Raises:
+        PermissionError: If the existing directory is not safe to use
+    """
+    spool_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    info = os.lstat(spool_dir)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"'{spool_dir}' is a symlink or not a directory")
+    if not hasattr(os, "getuid"):
+        return
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"'{spool_dir}' is owned by another user")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"'{spool_dir}' is writable by other users")
+
+
+def clean_spool(
+    spool_dir: Path,
+    max_age: float,
+    max_bytes: int,
+    reserve: int = 0,
+    min_age: float = SPOOL_MIN_AGE,
+):
+    """
+    Evict old result files from the spool directory.
+
+    Files older than max_age are removed first, then the oldest files until
+    the spool, plus the reserve about to be written, fits in max_bytes.
+    Files younger than min_age are kept even if the spool stays over
+    max_bytes, so a caller always has time to read its result.
+
+    Args:
+        spool_dir: Spool directory
+        max_age: Maximum age of a result file, in seconds
+        max_bytes: Maximum total size of the spool, in bytes
+        reserve: Size of the file about to be written, in bytes
+        min_age: Minimum age of a file evicted for size, in seconds
+    """
+    now = time.time()
+    files = []
+    for path in [*spool_dir.glob("edt-*.json"), *spool_dir.glob(".edt-*.json.*.tmp")]:
+        try:
+            info = path.stat()
+        except FileNotFoundError:
+            # Removed by a concurrent run
+            continue
+        if now - info.st_mtime > max_age:
+            path.unlink(missing_ok=True)
+        elif path.suffix == ".json":
+            files.append((info.st_mtime, info.st_size, path))
+
+    total = sum(size for _, size, _ in files) + reserve
+    for mtime, size, path in sorted(files):
+        if total <= max_bytes or now - mtime < min_age:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def write_to_spool(
+    content: str,
+    spool_dir: Optional[Path] = None,
+    max_age: float = DEFAULT_SPOOL_MAX_AGE,
+    max_bytes: int = DEFAULT_SPOOL_MAX_BYTES,
+) -> Path:
+    """
+    Write a result file to the managed spool directory.
+
+    The spool is cleaned up before writing (see clean_spool), so disk usage
+    stays bounded on long-running hosts, and the file is written atomically
+    so readers never see a partial result. The directory and the file are
+    only accessible to the current user (see prepare_spool_dir).
+
+    Args:
+        content: File content
+        spool_dir: Spool directory (default: see default_spool_dir)
+        max_age: Maximum age of a result file, in seconds
+        max_bytes: Maximum total size of the spool, in bytes
+
+    Returns:
+        Path of the result file
+
+    Raises:
+        PermissionError: If the spool directory is not safe to use
+    """
+    if spool_dir is None:
+        spool_dir = default_spool_dir()
+
+    prepare_spool_dir(spool_dir)
+    clean_spool(spool_dir, max_age, max_bytes, reserve=len(content.encode("utf-8")))
+
+    path = spool_dir / f"edt-{time.time_ns()}-{os.getpid()}.json"
+    write_atomic(path, content, mode=0o600)
+    return path
+
+
+def save_week_chunks(
+    entries: List[TimetableEntry],
+    output_dir: str,
+    year: int,
+    series: str = "edt",
+    compact: bool = False,
+    errors: Optional[List[Dict]] = None,
+) -> Path:
+    """
+    Save events as one payload per week, plus a manifest.
+
+    Each week (Monday to Sunday) is written to "<monday>.json" in the
+    Laravel payload format (compact format if requested), with events
+    sorted by start time. "manifest.json" lists every week with its start
+    date, file, event count and content hash. Chunks whose content did not
+    change are left untouched, and chunks of weeks that disappeared are
+    removed, so clients only need to fetch the weeks whose hash changed.
+
+    Args:
+        entries: List of TimetableEntry objects
+        output_dir: Directory to write the chunks and manifest to
+        year: Year for the timetable
+        series: Timetable series identifier used to derive event UIDs
+        compact: Write chunks in the compact format
+        errors: Timeout errors raised during extraction
+
+    Returns:
+        Path of the manifest
+    """
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / "manifest.json"
+
+    weeks: Dict[str, List[tuple[datetime, TimetableEntry]]] = {}
+    for entry in entries:
+        datetimes = get_event_datetimes(entry, year)
+        if not datetimes:
+            continue
+        monday = (datetimes[0] - timedelta(days=datetimes[0].weekday())).date()
+        weeks.setdefault(monday.isoformat(), []).append((datetimes[0], entry))
+
+    # A missing, corrupt or foreign manifest counts as no previous manifest,
+    # and only file names of our own chunks are ever removed
+    previous_files = set()
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("format") == "edt-weeks":
+            previous_files = {
+                week["file"]
+                for week in previous["weeks"]
+                if re.fullmatch(r"\d{4}-\d{2}-\d{2}\.json", week["file"])
+            }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        previous_files = set()
+
+    manifest_weeks = []
+    for start in sorted(weeks):
+        week_entries = [
+            entry
+            for _, entry in sorted(
+                weeks[start], key=lambda item: (item[0], item[1].table)
+            )
+        ]
+        if compact:
+            payload = build_compact_payload(week_entries, year, series)
+            content = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        else:
+            payload = build_laravel_payload(week_entries, year, series)
+            content = json.dumps(payload, ensure_ascii=False, indent=2)
+
+        file_name = f"{start}.json"
+        chunk_path = directory / file_name
+        if not chunk_path.exists() or chunk_path.read_text(encoding="utf-8") != content:
+            write_atomic(chunk_path, content)
+
+        manifest_weeks.append(
+            {
+                "start": start,
+                "file": file_name,
+                "count": len(payload["events"]),
+                "hash": hashlib.sha256(content.encode("utf-8")).hexdigest()[:16],
+            }
+        )
+
+    # Remove chunks of weeks that are no longer in the timetable
+    for file_name in previous_files - {week["file"] for week in manifest_weeks}:
+        (directory / file_name).unlink(missing_ok=True)
+
+    manifest = {
+        "format": "edt-weeks",
+        "version": 1,
+        "series": series,
+        "compact": compact,
+        "weeks": manifest_weeks,
+        "partial": bool(errors),
+        "errors": errors or [],
+    }
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    return manifest_path
+
+
+class AvailabilityIndex:
+    """
+    Half-day availability index built from timetable entries.
+
+    Every (date, slot) half-day of the timetable is a bit position, and the
+    busy half-days of each group (table index), teacher and course are
+    stored as an integer bitset. Free/busy queries over several of them are
+    then a handful of bitwise operations.
+
+    Each of them also has a coverage bitset: the weekday half-days of the
+    weeks its timetable covers (the weeks of the day rows of its table, or
+    of its groups' tables for teachers and courses). A half-day outside the
+    coverage is never free, e.g. for a table holding half a semester.
+    """
+
+    SLOTS = ("morning", "afternoon")
+
+    def __init__(
+        self,
+        entries: List[TimetableEntry],
+        year: int,
+        tables: Optional[List[List[List[str | None]]]] = None,
+    ):
+        placed = []
+        for entry in entries:
+            datetimes = get_event_datetimes(entry, year)
+            slot = get_slot_key(entry)
+            if datetimes and slot in self.SLOTS:
+                placed.append((datetimes[0].date(), self.SLOTS.index(slot), entry))
+
+        # Mondays of the weeks covered by each group
+        group_weeks: Dict[str, set[date]] = {}
+        for index, table in enumerate(tables or []):
+            for row in table:
+                if not row or not row[0] or not is_day_row(row):
+                    continue
+                for part in row[0].split()[1:]:
+                    week_date = parse_week_date(part, year) if "/" in part else None
+                    if week_date:
+                        monday = week_date.date() - timedelta(days=week_date.weekday())
+                        group_weeks.setdefault(str(index), set()).add(monday)
+        for day_date, _, entry in placed:
+            monday = day_date - timedelta(days=day_date.weekday())
+            group_weeks.setdefault(str(entry.table), set()).add(monday)
+
+        self.groups: Dict[str, int] = {}
+        self.teachers: Dict[str, int] = {}
+        self.courses: Dict[str, int] = {}
+        self.coverage: Dict[str, Dict[str, int]] = {
+            "groups": {},
+            "teachers": {},
+            "courses": {},
+        }
+
+        if not group_weeks:
+            self.start = datetime(year, 1, 1).date()
+            self.days = 0
+            self.universe = 0
+            return
+
+        # Cover whole weeks, from the first Monday to the last Sunday
+        mondays = set().union(*group_weeks.values())
+        self.start = min(mondays)
+        self.days = ((max(mondays) - self.start).days // 7 + 1) * 7
+
+        # Queries only cover weekdays
+        self.universe = 0
+        for day in range(self.days):
+            if (self.start + timedelta(days=day)).weekday() < 5:
+                for slot in range(len(self.SLOTS)):
+                    self.universe |= 1 << self.bit(day, slot)
+
+        # Weekday half-days of the first week, shifted to each covered week
+        week_mask = sum(
+            1 << self.bit(day, slot)
+            for day in range(5)
+            for slot in range(len(self.SLOTS))
+        )
+        for group, weeks in group_weeks.items():
+            for monday in weeks:
+                offset = self.bit((monday - self.start).days, 0)
+                self._mark(self.coverage["groups"], group, week_mask << offset)
+
+        for day_date, slot, entry in placed:
+            mask = 1 << self.bit((day_date - self.start).days, slot)
+            group = str(entry.table)
+            covered = self.coverage["groups"][group]
+            self._mark(self.groups, group, mask)
+            self._mark(self.courses, entry.course, mask)
+            self._mark(self.coverage["courses"], entry.course, covered)
+            if entry.professor:
+                self._mark(self.teachers, entry.professor, mask)
+                self._mark(self.coverage["teachers"], entry.professor, covered)
+
+    def bit(self, day: int, slot: int) -> int:
+        """Bit position of a half-day (day counted from the first Monday)"""
+        return day * len(self.SLOTS) + slot
+
+    @staticmethod
+    def _mark(bitsets: Dict[str, int], key: str, mask: int):
+        bitsets[key] = bitsets.get(key, 0) | mask
+
+    def busy(
+        self,
+        groups: Optional[List[str]] = None,
+        teachers: Optional[List[str]] = None,
+        courses: Optional[List[str]] = None,
+        combine: str = "any",
+    ) -> int:
+        """
+        Get the busy weekday half-days of groups, teachers and courses.
+
+        Args:
+            groups: Group (table index) names
+            teachers: Teacher names
+            courses: Course names
+            combine: "any" for half-days when any of them is busy (union),
+                "all" for half-days when all of them are busy (intersection)
+
+        Returns:
+            Bitset of busy half-days
+        """
+        bitsets = (
+            [self.groups.get(name, 0) for name in groups or []]
+            + [self.teachers.get(name, 0) for name in teachers or []]
+            + [self.courses.get(name, 0) for name in courses or []]
+        )
+        if not bitsets:
+            return 0
+
+        result = bitsets[0]
+        for bitset in bitsets[1:]:
+            result = result | bitset if combine == "any" else result & bitset
+        return result & self.universe
+
+    def free(
+        self,
+        groups: Optional[List[str]] = None,
+        teachers: Optional[List[str]] = None,
+        courses: Optional[List[str]] = None,
+        combine: str = "all",
+    ) -> int:
+        """
+        Get the free weekday half-days of groups, teachers and courses.
+
+        Each of them is only free within its coverage, so half-days outside
+        the weeks of its timetable are never returned.
+
+        Args:
+            groups: Group (table index) names
+            teachers: Teacher names
+            courses: Course names
+            combine: "all" for half-days when all of them are free
+                (intersection), "any" for half-days when any of them is free
+                (union)
+
+        Returns:
+            Bitset of free half-days
+        """
+        frees = [
+            self.coverage[kind].get(name, 0) & ~bitsets.get(name, 0)
+            for kind, names, bitsets in (
+                ("groups", groups, self.groups),
+                ("teachers", teachers, self.teachers),
+                ("courses", courses, self.courses),
+            )
+            for name in names or []
+        ]
+        if not frees:
+            return 0
+
+        result = frees[0]
+        for bitset in frees[1:]:
+            result = result & bitset if combine == "all" else result | bitset
+        return result & self.universe
+
+    def window(
+        self, weeks: Optional[List[int]] = None, slots: Optional[List[str]] = None
+    ) -> int:
+        """
+        Get a bitset restricting queries to some ISO weeks and slots.
+
+        Args:
+            weeks: ISO week numbers (None for every week)
+            slots: Slot names, e.g. ["afternoon"] (None for every slot)
+
+        Returns:
+            Bitset of the matching half-days
+        """
+        slot_ids = [
+            index
+            for index, name in enumerate(self.SLOTS)
+            if slots is None or name in slots
+        ]
+        mask = 0
+        for day in range(self.days):
+            day_date = self.start + timedelta(days=day)
+            if weeks is None or day_date.isocalendar()[1] in weeks:
+                for slot in slot_ids:
+                    mask |= 1 << self.bit(day, slot)
+        return mask
+
+    def half_days(self, bitset: int) -> List[tuple[date, str]]:
+        """
+        List the half-days of a bitset.
+
+        Args:
+            bitset: Bitset returned by busy, free or window
+
+        Returns:
+            Sorted list of (date, slot name) tuples
+        """
+        result = []
+        while bitset:
+            low = bitset & -bitset
+            position = low.bit_length() - 1
+            day, slot = divmod(position, len(self.SLOTS))
+            result.append((self.start + timedelta(days=day), self.SLOTS[slot]))
+            bitset ^= low
+        return result
+
+
+def week_spec(value: str) -> str:
+    """
+    Validate an ISO week selection for argparse (see parse_week_spec).
+
+    Args:
+        value: Week selection string
+
+    Returns:
+        The week selection, unchanged
+    """
+    parts = [part.strip() for part in value.split(",") if part.strip()]
+    if not parts:
+        raise argparse.ArgumentTypeError(f"invalid week selection: '{value}'")
+
+    for part in parts:
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", part)
+        if not match or not all(
+            1 <= int(week) <= 53 for week in match.groups() if week
+        ):
+            raise argparse.ArgumentTypeError(
+                f'invalid week selection: \'{value}\' (expected weeks 1-53, e.g. "10-20" or "36-52,1-5")'
+            )
+
+    return value
+
+
+def parse_week_spec(spec: str) -> List[int]:
+    """
+    Parse an ISO week selection like "10-20" or "36-52,1-5".
+
+    A range whose end is lower than its start wraps around the new year.
+
+    Args:
+        spec: Week selection string
+
+    Returns:
+        List of ISO week numbers
+    """
+    weeks = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            if end < start:
+                weeks.update(range(start, 54))
+                start = 1
+            weeks.update(range(start, end + 1))
+        else:
+            weeks.add(int(part))
+    return sorted(weeks)
+
+
+def availability_main(argv: List[str]):
+    """Run the "availability" subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="main.py availability",
+        description="Find free or busy half-days of groups, teachers and courses",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Common free afternoons of groups 0, 1 and 2 in weeks 10 to 20
+  python main.py availability timetable.pdf --pages all --group 0 --group 1 --group 2 --slot afternoon --weeks 10-20
+
+  # Half-days when a teacher is busy, from a raw snapshot
+  python main.py availability --from-raw timetable.raw.json.gz --teacher DUPONT --busy
+
+  # Export the result
+  python main.py availability timetable.pdf --group 0 --output free.csv
+        """,
+    )
+    parser.add_argument(
+        "pdf_file", nargs="?", help="Path to the PDF file (omit with --from-raw)"
+    )
+    parser.add_argument("--from-raw", metavar="PATH", help="Raw snapshot to read")
+    parser.add_argument(
+        "--pages",
+        type=page_spec,
+        default="0",
+        help='Pages to extract, e.g. "all" or "0,2-4" (0-indexed, default: 0)',
+    )
+    parser.add_argument(
+        "--year", type=int, help="Year for the timetable (default: 2025)"
+    )
+    parser.add_argument(
+        "--group",
+        action="append",
+        help="Group (table index) to query, can be repeated",
+    )
+    parser.add_argument(
+        "--teacher", action="append", help="Teacher to query, can be repeated"
+    )
+    parser.add_argument(
+        "--course", action="append", help="Course to query, can be repeated"
+    )
+    parser.add_argument(
+        "--busy",
+        action="store_true",
+        help="List busy half-days instead of free ones",
+    )
+    parser.add_argument(
+        "--any",
+        action="store_true",
+        help="Combine with a union (any of them) instead of an intersection (all of them)",
+    )
+    parser.add_argument(
+        "--weeks",
+        type=week_spec,
+        help='ISO weeks to consider, e.g. "10-20" or "36-52,1-5"',
+    )
+    parser.add_argument(
+        "--slot",
+        action="append",
+        choices=AvailabilityIndex.SLOTS,
+        help="Slot to consider, can be repeated (default: all)",
+    )
+    parser.add_argument("--output", "-o", help="Output file path (CSV or JSON)")
+
+    args = parser.parse_args(argv)
+
+    if not args.pdf_file and not args.from_raw:
+        parser.error("a PDF file or --from-raw is required")
+
+    if args.from_raw:
+        try:
+            pages_tables = load_raw_snapshot(args.from_raw)["pages"]
+        except (OSError, ValueError) as error:
+            print(f"Error: Cannot read raw snapshot '{args.from_raw}': {error}")
+            sys.exit(1)
+    else:
+        pages_tables, _ = extract_tables_with_budget(args.pdf_file, args.pages)
+
+    tables = stitch_tables(pages_tables)
+    entries = parse_tables(tables)
+    index = AvailabilityIndex(entries, args.year if args.year else 2025, tables)
+
+    for option, names, known in (
+        ("--group", args.group, index.groups),
+        ("--teacher", args.teacher, index.teachers),
+        ("--course", args.course, index.courses),
+    ):
+        unknown = [name for name in names or [] if name not in known]
+        if unknown:
+            parser.error(
+                f"{option}: unknown {', '.join(map(repr, unknown))} "
+                f"(known: {', '.join(sorted(known)) or 'none'})"
+            )
+
+    # Default to every group
+    groups = args.group
+    if not any([args.group, args.teacher, args.course]):
+        groups = list(index.groups)
+
+    combine = "any" if args.any else "all"
+    if args.busy:
+        result = index.busy(groups, args.teacher, args.course, combine)
+    else:
+        result = index.free(groups, args.teacher, args.course, combine)
+
+    weeks = parse_week_spec(args.weeks) if args.weeks else None
+    result &= index.window(weeks, args.slot)
+
+    half_days = [
+        {
+            "date": day.isoformat(),
+            "day": day.strftime("%A"),
+            "week": day.isocalendar()[1],
+            "slot": slot,
+        }
+        for day, slot in index.half_days(result)
+    ]
+
+    if args.output:
+        if Path(args.output).suffix.lower() == ".json":
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(half_days, f, indent=2, ensure_ascii=False)
+        else:
+            import csv
+
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=["date", "day", "week", "slot"])
+                writer.writeheader()
+                writer.writerows(half_days)
+        return
+
+    if not half_days:
+        print("No matching half-days")
+        return
+
+    for half_day in half_days:
+        print(
+            f"{half_day['date']} {half_day['day']:<9} (week {half_day['week']:>2}) {half_day['slot']}"
+        )
+
+
 def main():
+    if sys.argv[1:2] == ["availability"]:
+        availability_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Extract timetable data from PDF files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -666,16 +2020,43 @@ Examples:
 
   # Show raw table without parsing
   python main.py timetable.pdf --raw
+
+  # Save extracted tables once, then parse them again without the PDF
+  python main.py timetable.pdf --pages all --dump-raw timetable.raw.json.gz
+  python main.py --from-raw timetable.raw.json.gz --output timetable.ics --year 2025
+
+  # Common free afternoons of groups 0 and 1 (see: main.py availability --help)
+  python main.py availability timetable.pdf --group 0 --group 1 --slot afternoon
+
+  # Extract every page, giving up after 20s per page or 60s overall
+  python main.py timetable.pdf --pages all --page-timeout 20 --job-timeout 60
         """,
     )
 
-    parser.add_argument("pdf_file", help="Path to the PDF file")
+    parser.add_argument(
+        "pdf_file", nargs="?", help="Path to the PDF file (omit with --from-raw)"
+    )
     parser.add_argument(
         "--page",
         type=int,
         default=0,
         help="Page number to extract (0-indexed, default: 0)",
     )
+    parser.add_argument(
+        "--pages",
+        type=page_spec,
+        help='Pages to extract, e.g. "all" or "0,2-4" (0-indexed, overrides --page)',
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        help="Maximum seconds spent extracting a single page (default: no limit)",
+    )
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        help="Maximum seconds spent extracting all pages (default: no limit)",
+    )
     parser.add_argument("--x", type=float, help="X coordinate of table region")
     parser.add_argument("--y", type=float, help="Y coordinate of table region")
     parser.add_argument("--width", type=float, help="Width of table region")
@@ -686,17 +2067,83 @@ Examples:
         type=int,
         help="Year for the timetable (for ICS export, default: 2025)",
     )
+    parser.add_argument(
+        "--series",
+        default="edt",
+        help="Timetable series identifier used to derive stable event UIDs (default: edt)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "compact"],
+        default="json",
+        help="Format of the default Laravel payload (default: json)",
+    )
+    parser.add_argument(
+        "--spool-dir",
+        help="Directory of the default JSON result files (default: edt-ocr-<uid> in the system temp directory)",
+    )
+    parser.add_argument(
+        "--spool-max-age",
+        type=float,
+        default=DEFAULT_SPOOL_MAX_AGE,
+        help=f"Seconds after which result files are evicted from the spool (default: {DEFAULT_SPOOL_MAX_AGE})",
+    )
+    parser.add_argument(
+        "--spool-max-bytes",
+        type=int,
+        default=DEFAULT_SPOOL_MAX_BYTES,
+        help=f"Maximum total size of the spool in bytes (default: {DEFAULT_SPOOL_MAX_BYTES})",
+    )
+    parser.add_argument(
+        "--result-fd",
+        type=int,
+        metavar="FD",
+        help="Write the default JSON result to this file descriptor (e.g. a pipe) instead of the spool",
+    )
+    parser.add_argument(
+        "--split-weeks",
+        metavar="DIR",
+        help="Write one Laravel payload per week and a manifest.json to DIR",
+    )
     parser.add_argument(
         "--raw", action="store_true", help="Show raw table without parsing"
     )
     parser.add_argument(
         "--max-rows", type=int, help="Maximum rows to display in raw table view"
     )
+    parser.add_argument(
+        "--dump-raw",
+        metavar="PATH",
+        help="Save the extracted tables to a raw snapshot (.json or .json.gz) and exit",
+    )
+    parser.add_argument(
+        "--from-raw",
+        metavar="PATH",
+        help="Parse tables from a raw snapshot instead of a PDF",
+    )
 
     args = parser.parse_args()
 
+    if not args.pdf_file and not args.from_raw:
+        parser.error("a PDF file or --from-raw is required")
+
+    timeout_errors: List[TimeBudgetExceeded] = []
+    pages = args.pages if args.pages else str(args.page)
+
     # Extract table
-    if any([args.x, args.y, args.width, args.height]):
+    if args.from_raw:
+        try:
+            snapshot = load_raw_snapshot(args.from_raw)
+        except (OSError, ValueError) as error:
+            print(f"Error: Cannot read raw snapshot '{args.from_raw}': {error}")
+            sys.exit(1)
+
+        pages_tables = snapshot["pages"]
+        timeout_errors = [
+            TimeBudgetExceeded(error["page"], error["budget"], error["seconds"])
+            for error in snapshot["errors"]
+        ]
+    elif any([args.x, args.y, args.width, args.height]):
         if not all([args.x, args.y, args.width, args.height]):
             print(
                 "Error: All coordinates (x, y, width, height) must be specified together"
@@ -706,22 +2153,54 @@ Examples:
         table = extract_table_with_coordinates(
             args.pdf_file, args.page, args.x, args.y, args.width, args.height
         )
+        pages_tables = [[table] if table else []]
+    elif args.pages or args.page_timeout or args.job_timeout:
+        pages_tables, timeout_errors = extract_tables_with_budget(
+            args.pdf_file,
+            pages,
+            page_timeout=args.page_timeout,
+            job_timeout=args.job_timeout,
+        )
     else:
-        table = extract_table_from_pdf(args.pdf_file, args.page)
+        pages_tables = [extract_tables_from_pdf(args.pdf_file, args.page)]
 
-    if not table:
+    # Report budget overruns on stderr, stdout is reserved for the output path
+    for timeout_error in timeout_errors:
+        print(json.dumps(timeout_error.to_dict()), file=sys.stderr)
+
+    # Save a raw snapshot if requested
+    if args.dump_raw:
+        if args.from_raw:
+            source = snapshot["source"]
+        else:
+            source = get_source_metadata(args.pdf_file, pages)
+            if args.x is not None:
+                source["region"] = [args.x, args.y, args.width, args.height]
+        save_raw_snapshot(
+            pages_tables,
+            args.dump_raw,
+            source,
+            errors=[error.to_dict() for error in timeout_errors],
+        )
+        return
+
+    tables = stitch_tables(pages_tables)
+
+    if not tables:
         print("No table data extracted")
         sys.exit(1)
 
     # Show raw table if requested
     if args.raw:
-        print("\n=== RAW TABLE ===\n")
-        print_table(table, max_rows=args.max_rows)
+        for index, table in enumerate(tables):
+            title = f"RAW TABLE {index}" if len(tables) > 1 else "RAW TABLE"
+            print(f"\n=== {title} ===\n")
+            print_table(table, max_rows=args.max_rows)
         return
 
     # Parse timetable
     # print("\nParsing timetable...")
-    entries = parse_timetable(table)
+    entries = parse_tables(tables)
 
     # print(f"\nExtracted {len(entries)} timetable entries")
 
@@ -734,94 +2213,62 @@ Examples:
         if output_path.suffix.lower() == ".json":
             save_to_json(entries, args.output)
         elif output_path.suffix.lower() in [".ics", ".ical"]:
-            save_to_ics(entries, args.output, year=args.year)
+            save_to_ics(entries, args.output, year=args.year, series=args.series)
         else:
             save_to_csv(entries, args.output)
         return
 
+    # Week-partitioned output, printing only the manifest path like below
+    if args.split_weeks:
+        manifest_path = save_week_chunks(
+            entries,
+            args.split_weeks,
+            args.year if args.year else 2025,
+            series=args.series,
+            compact=args.format == "compact",
+            errors=[error.to_dict() for error in timeout_errors],
+        )
+        print(manifest_path)
+        return
+
     # Default: Generate JSON output for Laravel integration
     # Write to a temporary file to avoid stdout contamination from library warnings
-    events = []
     year = args.year if args.year else 2025
 
-    # Time slot mappings
-    time_slots = {
-        "morning (8:30-12:15)": ("08:30", "12:15"),
-        "afternoon (13:30-17:15)": ("13:30", "17:15"),
-    }
-
-    for entry in entries:
-        # Parse the week date
-        event_date = parse_week_date(entry.week, year)
-        if not event_date:
-            continue
-
-        # Adjust to correct day of week
-        day_offset = get_day_offset(entry.day)
-        # Get the Monday of that week
-        days_since_monday = event_date.weekday()
-        monday = event_date - timedelta(days=days_since_monday)
-        # Add offset for target day
-        target_date = monday + timedelta(days=day_offset)
-
-        # Get time slot
-        time_slot_key = entry.time_slot.lower()
-        if time_slot_key not in time_slots:
-            # Try to match partial
-            for key in time_slots:
-                if key.split("(")[0].strip() in time_slot_key:
-                    time_slot_key = key
-                    break
+    if args.format == "compact":
+        output_data = build_compact_payload(entries, year, args.series)
+    else:
+        output_data = build_laravel_payload(entries, year, args.series)
 
-        start_time, end_time = time_slots.get(time_slot_key, ("08:30", "12:15"))
+    output_data["partial"] = bool(timeout_errors)
+    output_data["errors"] = [error.to_dict() for error in timeout_errors]
 
-        # Create start and end datetime
-        start_hour, start_min = map(int, start_time.split(":"))
-        end_hour, end_min = map(int, end_time.split(":"))
+    if args.format == "compact":
+        content = json.dumps(output_data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        content = json.dumps(output_data, ensure_ascii=False, indent=2)
 
-        dtstart = datetime(
-            target_date.year, target_date.month, target_date.day, start_hour, start_min
-        )
-        dtend = datetime(
-            target_date.year, target_date.month, target_date.day, end_hour, end_min
-        )
+    # Hand the payload back over a pipe opened by the caller
+    if args.result_fd is not None:
+        with os.fdopen(args.result_fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        return
 
-        # Convert to format expected by Laravel
-        events.append(
-            {
-                "title": entry.course,
-                "teacher": entry.professor if entry.professor else None,
-                "description": f"{entry.course} - {entry.professor}"
-                if entry.professor
-                else entry.course,
-                "location": None,  # Not available in PDF
-                "start_time": dtstart.isoformat(),
-                "end_time": dtend.isoformat(),
-                "type": "exam" if "[EXAMEN]" in entry.course else "course",
-                "color": None,
-            }
+    # Write to the spool instead of stdout to avoid library warnings
+    spool_dir = Path(args.spool_dir) if args.spool_dir else default_spool_dir()
+    try:
+        output_file = write_to_spool(
+            content,
+            spool_dir,
+            max_age=args.spool_max_age,
+            max_bytes=args.spool_max_bytes,
         )
+    except OSError as error:
+        print(f"Error: Cannot write to spool '{spool_dir}': {error}", file=sys.stderr)
+        sys.exit(1)
 
-        output_data = {
-            "events": events,
-            "summary": {
-                "total": len(events),
-                "courses": len([e for e in events if e["type"] == "course"]),
-                "exams": len([e for e in events if e["type"] == "exam"]),
-            },
-        }
-
-        # Write to temporary file instead of stdout to avoid library warnings
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False, encoding="utf-8"
-        ) as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
-            output_file = f.name
-
-        # Print only the filename to stdout so Laravel can read it
-        print(output_file)
+    # Print only the filename to stdout so Laravel can read it
+    print(output_file)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 <?php
 
-use App\Models\Event;
+use App\Services\IcsImportService;
 use App\Services\PdfImportService;
 use Carbon\Carbon;
 use Livewire\WithFileUploads;
@@ -89,52 +89,16 @@
     }
 
     $this->processing = true;
-    $count = 0;
 
     try {
-        // Si on doit remplacer l'emploi du temps existant, supprimer tous les cours
-        if ($this->replaceExisting) {
-            $events = collect($this->extractedData['events']);
-
-            $min = $events->min(function ($event) {
-                return Carbon::parse($event['start_time']);
-            });
-            $max = $events->max(function ($event) {
-                return Carbon::parse($event['end_time']);
-            });
-
-            Event::query()
-                ->whereNot('source', 'manual')
-                ->where(function ($query) use ($min, $max) {
-                    $query->whereBetween('start_time', [$min, $max])
-                        ->orWhereBetween('end_time', [$min, $max]);
-                })
-                ->delete();
-        }
-
-        foreach ($this->extractedData['events'] as $eventData) {
-            // Ignorer les événements passés si l'option est activée
-            if ($this->ignorePassedEvents) {
-                $eventStart = Carbon::parse($eventData['start_time']);
-                if ($eventStart->isPast()) {
-                    continue;
-                }
-            }
-
-            Event::create([
-                'title' => $eventData['title'] ?? 'Cours sans titre',
-                'description' => $eventData['description'] ?? null,
-                'teacher' => $eventData['teacher'] ?? null,
-                'location' => $eventData['location'] ?? null,
-                'start_time' => $eventData['start_time'],
-                'end_time' => $eventData['end_time'],
-                'type' => $eventData['type'] ?? 'course',
-                'color' => $eventData['color'] ?? null,
-                'source' => 'pdf_import',
-                'created_by' => auth()->id(),
-            ]);
-            $count++;
-        }
+        // Synchronisation sur les UID (external_id) générés par main.py :
+        // seuls les événements nouveaux ou modifiés sont écrits
+        $result = (new IcsImportService)->importEvents($this->extractedData['events'], auth()->id(), [
+            'replace_existing' => $this->replaceExisting,
+            'ignore_past_events' => $this->ignorePassedEvents,
+            'source' => 'pdf_import',
+        ]);
+        $count = $result['imported'];
 
         $this->importedCount = $count;
 
@@ -377,6 +341,31 @@ class="inline-flex items-center gap-2 rounded-lg bg-blue-600 px-4 py-2 text-sm f
             </flux:badge>
         </div>
 
+        {{-- Extraction partielle : budget de temps dépassé sur certaines pages --}}
+        @if (! empty($extractedData['partial']))
+            <div class="mb-4 rounded-lg border border-amber-200 bg-amber-50 p-4 dark:border-amber-800 dark:bg-amber-950/30">
+                <div class="flex items-start gap-3">
+                    <flux:icon.exclamation-triangle class="size-5 shrink-0 text-amber-600 dark:text-amber-400"/>
+                    <div>
+                        <flux:heading size="sm" class="text-sm font-medium text-amber-900 dark:text-amber-200">
+                            Extraction incomplète
+                        </flux:heading>
+                        <flux:text class="mt-1 text-sm text-amber-700 dark:text-amber-300">
+                            Certaines pages ont dépassé le temps de traitement autorisé et n'ont pas été importées :
+                        </flux:text>
+                        <ul class="mt-1 list-disc pl-5 text-sm text-amber-700 dark:text-amber-300">
+                            @foreach ($extractedData['errors'] ?? [] as $error)
+                                <li>
+                                    Page {{ $error['page'] + 1 }}
+                                    ({{ $error['budget'] === 'job' ? 'budget global' : 'budget par page' }} de {{ $error['seconds'] }} s)
+                                </li>
+                            @endforeach
+                        </ul>
+                    </div>
+                </div>
+            </div>
+        @endif
+
         @if ($extractedData && !empty($extractedData['events']))
             {{-- Affichage des données extraites --}}
             <div class="space-y-2 max-h-96 overflow-y-auto">
@@ -115,3 +115,159 @@
         ->and(Event::count())->toBe(1)
         ->and(Event::first()->title)->toBe('New Course');
 });
+
+test('ics service skips events whose hash did not change', function () {
+    $user = User::factory()->create(['is_admin' => true]);
+    $service = new IcsImportService();
+
+    $existing = Event::factory()->create([
+        'title' => 'Maths',
+        'source' => 'pdf_import',
+        'external_id' => 'uid-1@edt-ocr',
+        'metadata' => ['hash' => 'aaaa'],
+    ]);
+
+    $events = [
+        [
+            'title' => 'Maths',
+            'type' => 'course',
+            'start_time' => now()->addDay(),
+            'end_time' => now()->addDay()->addHours(2),
+            'external_id' => 'uid-1@edt-ocr',
+            'hash' => 'aaaa',
+        ],
+    ];
+
+    $result = $service->importEvents($events, $user->id, ['replace_existing' => true]);
+
+    expect($result['imported'])->toBe(0)
+        ->and($result['skipped'])->toBe(1)
+        ->and(Event::count())->toBe(1)
+        ->and(Event::first()->id)->toBe($existing->id);
+});
+
+test('ics service updates events whose hash changed without replace option', function () {
+    $user = User::factory()->create(['is_admin' => true]);
+    $service = new IcsImportService();
+
+    $existing = Event::factory()->create([
+        'title' => 'Maths',
+        'source' => 'pdf_import',
+        'external_id' => 'uid-1@edt-ocr',
+        'metadata' => ['hash' => 'aaaa'],
+    ]);
+
+    $events = [
+        [
+            'title' => 'Physique',
+            'type' => 'course',
+            'start_time' => now()->addDay(),
+            'end_time' => now()->addDay()->addHours(2),
+            'external_id' => 'uid-1@edt-ocr',
+            'hash' => 'bbbb',
+        ],
+    ];
+
+    $result = $service->importEvents($events, $user->id);
+
+    $existing->refresh();
+
+    expect($result['imported'])->toBe(1)
+        ->and(Event::count())->toBe(1)
+        ->and($existing->title)->toBe('Physique')
+        ->and($existing->metadata['hash'])->toBe('bbbb')
+        ->and($existing->updated_by)->toBe($user->id);
+});
+
+test('ics service keeps synced events and removes stale ones when replacing', function () {
+    $user = User::factory()->create(['is_admin' => true]);
+    $service = new IcsImportService();
+
+    $synced = Event::factory()->create([
+        'title' => 'Maths',
+        'source' => 'pdf_import',
+        'start_time' => now()->addDay(),
+        'end_time' => now()->addDay()->addHours(2),
+        'external_id' => 'uid-1@edt-ocr',
+        'metadata' => ['hash' => 'aaaa'],
+    ]);
+    Event::factory()->create([
+        'title' => 'Cours supprimé',
+        'source' => 'pdf_import',
+        'start_time' => now()->addDay()->addHours(3),
+        'end_time' => now()->addDay()->addHours(5),
+        'external_id' => 'uid-2@edt-ocr',
+    ]);
+
+    $events = [
+        [
+            'title' => 'Maths',
+            'type' => 'course',
+            'start_time' => now()->addDay()->toIso8601String(),
+            'end_time' => now()->addDays(2)->toIso8601String(),
+            'external_id' => 'uid-1@edt-ocr',
+            'hash' => 'aaaa',
+        ],
+    ];
+
+    $result = $service->importEvents($events, $user->id, ['replace_existing' => true]);
+
+    expect($result['skipped'])->toBe(1)
+        ->and(Event::count())->toBe(1)
+        ->and(Event::first()->id)->toBe($synced->id);
+});
+
+test('ics service stores the hash of new events', function () {
+    $user = User::factory()->create(['is_admin' => true]);
+    $service = new IcsImportService();
+
+    $events = [
+        [
+            'title' => 'Maths',
+            'type' => 'course',
+            'start_time' => now()->addDay(),
+            'end_time' => now()->addDay()->addHours(2),
+            'external_id' => 'uid-1@edt-ocr',
+            'hash' => 'aaaa',
+        ],
+    ];
+
+    $result = $service->importEvents($events, $user->id, ['source' => 'pdf_import']);
+
+    $event = Event::first();
+    expect($result['imported'])->toBe(1)
+        ->and($event->metadata['hash'])->toBe('aaaa')
+        ->and($event->source)->toBe('pdf_import');
+});
+
+test('ics service reads the uid and hash of an ics generated by main.py', function () {
+    $user = User::factory()->create(['is_admin' => true]);
+    $service = new IcsImportService();
+
+    // Généré par save_to_ics() dans main.py
+    $parsed = $service->parseIcsFile(base_path('tests/Fixtures/edt-ocr.ics'));
+
+    expect($parsed['events'])->toHaveCount(2)
+        ->and($parsed['events'][0]['external_id'])->toBe('7a9c74b58693e53e7e6d@edt-ocr')
+        ->and($parsed['events'][0]['metadata']['hash'])->toBe('6b220d74370f4ba6');
+
+    $service->importEvents($parsed['events'], $user->id, [
+        'ignore_past_events' => false,
+        'source' => 'pdf_import',
+    ]);
+
+    $event = Event::where('external_id', '7a9c74b58693e53e7e6d@edt-ocr')->first();
+    expect(Event::count())->toBe(2)
+        ->and($event->metadata['hash'])->toBe('6b220d74370f4ba6');
+
+    // Réimporter le même fichier ne modifie rien
+    $result = $service->importEvents($parsed['events'], $user->id, [
+        'ignore_past_events' => false,
+        'replace_existing' => true,
+        'source' => 'pdf_import',
+    ]);
+
+    expect($result['skipped'])->toBe(2)
+        ->and($result['imported'])->toBe(0)
+        ->and(Event::count())->toBe(2);
+});
@@ -0,0 +1,154 @@
+"""Tests of the timetable extraction script (main.py)"""
+
+import json
+import time
+
+import pytest
+
+import main
+from main import parse_tables, stitch_tables
+
+
+def group_table(course: str, professor: str):
+    """Morning of a group's timetable, continued on the next page"""
+    return [
+        ["Lundi 15/9", None],
+        ["matin", course],
+        [None, professor],
+        [None, None],
+    ]
+
+
+def group_continuation(course: str, professor: str):
+    """Afternoon of a group's timetable, at the top of the next page"""
+    return [
+        ["après-midi", course],
+        [None, professor],
+    ]
+
+
+def test_stitch_side_by_side_tables_split_by_a_page_break():
+    a, a_cont = group_table("Maths", "DUPONT"), group_continuation("Chimie", "CURIE")
+    b, b_cont = group_table("Anglais", "SMITH"), group_continuation("Info", "MARTIN")
+
+    assert stitch_tables([[a, b], [a_cont, b_cont]]) == [a + a_cont, b + b_cont]
+
+
+def test_parse_side_by_side_tables_split_by_a_page_break():
+    pages_tables = [
+        [group_table("Maths", "DUPONT"), group_table("Anglais", "SMITH")],
+        [group_continuation("Chimie", "CURIE"), group_continuation("Info", "MARTIN")],
+    ]
+
+    entries = parse_tables(stitch_tables(pages_tables))
+
+    assert sorted((entry.table, entry.course) for entry in entries) == [
+        (0, "Chimie"),
+        (0, "Maths"),
+        (1, "Anglais"),
+        (1, "Info"),
+    ]
+
+
+def test_stitch_continuation_without_matching_table_extends_previous():
+    a, a_cont = group_table("Maths", "DUPONT"), group_continuation("Chimie", "CURIE")
+    extra = group_continuation("Info", "MARTIN")
+
+    assert stitch_tables([[a], [a_cont, extra]]) == [a + a_cont + extra]
+
+
+class SlowPage:
+    """PDF page whose table extraction takes some time"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def extract_tables(self):
+        time.sleep(self.seconds)
+        return [[["Lundi 15/9"]]]
+
+
+class SlowPdf:
+    def __init__(self, seconds: list[float]):
+        self.pages = [SlowPage(value) for value in seconds]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_job_timeout_reports_every_skipped_page(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "timetable.pdf"
+    pdf_path.touch()
+    monkeypatch.setattr(
+        main.pdfplumber, "open", lambda path: SlowPdf([0.0, 2.0, 0.0, 0.0])
+    )
+
+    tables, errors = main.extract_tables_with_budget(
+        str(pdf_path), "all", job_timeout=0.5
+    )
+
+    assert len(tables) == 1
+    assert [(error.page, error.budget) for error in errors] == [
+        (1, "job"),
+        (2, "job"),
+        (3, "job"),
+    ]
+
+
+def test_free_half_days_stay_within_the_weeks_of_the_group_table():
+    # Autumn and spring halves of the semester laid out as two tables
+    autumn = [["Lundi 15/9 22/9", None, None], ["matin", "Maths", None]]
+    spring = [["Lundi 5/1", None], ["matin", "Anglais"]]
+    tables = [autumn, spring]
+    index = main.AvailabilityIndex(parse_tables(tables), 2025, tables)
+
+    free_weeks = {day.isocalendar()[1] for day, _ in index.half_days(index.free(["0"]))}
+    busy = index.half_days(index.busy(["0"]))
+
+    assert free_weeks == {38, 39}
+    assert [(day.isoformat(), slot) for day, slot in busy] == [
+        ("2025-09-15", "morning")
+    ]
+    assert index.free(["0"]) & index.busy(["1"]) == 0
+
+
+def test_spool_without_getuid(tmp_path, monkeypatch):
+    monkeypatch.delattr(main.os, "getuid")
+    monkeypatch.setattr(main.tempfile, "gettempdir", lambda: str(tmp_path))
+
+    path = main.write_to_spool("{}")
+
+    assert path.parent == tmp_path / "edt-ocr"
+    assert path.read_text(encoding="utf-8") == "{}"
+
+
+@pytest.mark.parametrize(
+    "snapshot",
+    [
+        [],
+        {"format": "edt-raw", "version": 1, "source": {}, "errors": []},
+        {"format": "edt-raw", "version": 1, "source": {}, "pages": [[1]], "errors": []},
+        {"format": "edt-raw", "version": 1, "source": {}, "pages": [], "errors": [{}]},
+    ],
+)
+def test_load_raw_snapshot_rejects_invalid_structure(tmp_path, snapshot):
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        main.load_raw_snapshot(str(path))
+
+
+def test_raw_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    pages_tables = [[group_table("Maths", "DUPONT")]]
+    errors = [{"error": "timeout", "page": 1, "budget": "page", "seconds": 20.0}]
+
+    main.save_raw_snapshot(pages_tables, path, {"file": "edt.pdf"}, errors)
+    snapshot = main.load_raw_snapshot(path)
+
+    assert snapshot["pages"] == pages_tables
+    assert snapshot["errors"] == errors